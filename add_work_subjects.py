@@ -12,44 +12,65 @@ Examples:
 import argparse
 import sys
 
+from lxml import etree
+
 from tei.elements import Bibl, Category, Namespace
 from tei.xml import WorksFile
 
+# <bibl> elements in the text with an xml:id but no <term> child, leaving
+# out the header and its taxonomy of categories
+_BIBL_XPATH = etree.XPath(
+    "/tei:TEI/tei:text//tei:bibl[@xml:id and not(tei:term)]",
+    namespaces=Namespace.tei,
+)
+
+# The number of classified <bibl> elements to keep before saving the file,
+# so that little is lost if the session ends without the script exiting
+_WRITE_EVERY = 10
 
-class CategorySelector(list[str]):
+
+class CategorySelector:
     """Prompt the user to select a category.
 
     Attributes:
-        bibl_title (str): The title of the <bibl> element
-        categories (list[Category]): The available categories
+        category_ids (list[str]): The IDs of the available categories
+        category_descriptions (list[str]): Their descriptions, in order
+        menu (str): The numbered list of categories shown to the user
 
     Methods:
         __call__: Prompt the user for input and return the selected categories
-        _print_categories: Print the available categories in rows of three
+        _format_categories: Format the available categories in rows of three
     """
 
-    def __call__(
-        self, bibl_title: str, categories: list[Category]
-    ) -> list[str]:
+    def __init__(self, categories: list[Category]) -> None:
+        """Store the IDs and descriptions of the available categories.
+
+        Args:
+            categories (list[Category]): The available categories
+        """
+        self.category_ids: list[str] = [category.id for category in categories]
+        self.category_descriptions: list[str] = [
+            category.category_description for category in categories
+        ]
+        self.menu: str = self._format_categories(self.category_descriptions)
+
+    def __call__(self, bibl_title: str) -> list[str]:
         """Return category IDs from the user's selection.
 
         Args:
             bibl_title (str): The title of the <bibl> element
-            categories (list[Category]): The available categories
 
         Returns:
             list[str]: The selected category IDs
         """
         while True:
             print(f"\n{bibl_title}\n")
-            self._print_categories(
-                [category.category_description for category in categories]
-            )
+            print(self.menu, end="")
             selection: str = input("\nEnter one or more category numbers: ")
             try:
                 # return a list of the category IDs from the user's selection
                 return [
-                    categories[int(index) - 1].id
+                    self.category_ids[int(index) - 1]
                     for index in selection.split()
                 ]
             except ValueError:
@@ -59,17 +80,22 @@ class CategorySelector(list[str]):
                 sys.stderr.write("Please select from the numbers listed.")
                 continue
 
-    def _print_categories(self, category_descriptions: list[str]) -> None:
-        """Print the available categories in rows of three.
+    def _format_categories(self, category_descriptions: list[str]) -> str:
+        """Format the available categories in rows of three.
 
         Args:
             category_descriptions (list[str]): Category descriptions
+
+        Returns:
+            str: The numbered categories, ready to print
         """
+        menu: list[str] = []
         for index, description in enumerate(category_descriptions, start=1):
-            print(f"{index:>2}. {description:<25}", end="")
-            # print a newline after every third category
+            menu.append(f"{index:>2}. {description:<25}")
+            # add a newline after every third category
             if index % 3 == 0:
-                print("\n", end="")
+                menu.append("\n")
+        return "".join(menu)
 
 
 def main() -> int:
@@ -93,28 +119,36 @@ def main() -> int:
 
     works = WorksFile(args.works_file_path)
 
-    # Iterate over <bibl> elements with an xml:id but no <term> child
-    for bibl_element in works.tree.xpath(
-        "//tei:bibl[@xml:id and not(tei:term)]", namespaces=Namespace.tei
-    ):
-        # Create a Work object for manipulating the <bibl> element
-        bibl: Bibl = Bibl(bibl_element)
-
-        # Get the user's selection of categories
-        selected_categories: list[str] = CategorySelector()(
-            bibl.title, works.categories
-        )
-
-        # If there is no selection, skip to the next <bibl> element
-        if not selected_categories:
-            continue
-
-        # Add <term> elements for the selected categories
-        for category in selected_categories:
-            bibl.add_term(category)
+    # Iterate over <bibl> elements with an xml:id but no <term> child,
+    # writing the XML file every few selections and once more at the end
+    # (or if the user quits early)
+    select_categories = CategorySelector(works.categories)
+    unsaved: int = 0
+    try:
+        for bibl_element in _BIBL_XPATH(works.tree):
+            # Create a Work object for manipulating the <bibl> element
+            bibl: Bibl = Bibl(bibl_element)
+
+            # Get the user's selection of categories
+            selected_categories: list[str] = select_categories(bibl.title)
+
+            # If there is no selection, skip to the next <bibl> element
+            if not selected_categories:
+                continue
 
-        # Update the XML file
-        works.write()
+            # Add <term> elements for the selected categories
+            for category in selected_categories:
+                bibl.add_term(category)
+            unsaved += 1
+
+            # Update the XML file with the latest selections
+            if unsaved == _WRITE_EVERY:
+                works.write()
+                unsaved = 0
+    finally:
+        # Update the XML file with any remaining selections
+        if unsaved:
+            works.write()
 
     return 0
 
@@ -10,13 +10,35 @@ Examples:
 """
 
 import argparse
+import contextlib
 import re
 import sys
+from typing import BinaryIO
 
 from lxml import etree
 
 from entities.viaf import VIAF
 
+# A VIAF ID in a URL (https://viaf.org/viaf/34512366) or a key (org_34512366)
+_VIAF_ID_RE = re.compile(r"viaf/(\d+)|(\d+)")
+
+
+def _write_elements(
+    output_file: BinaryIO, elements: list[etree.Element]
+) -> None:
+    """Write each element to a file as UTF-8, separated by blank lines.
+
+    Args:
+        output_file (BinaryIO): The file to write to.
+        elements (list[etree.Element]): The elements to write.
+    """
+    for index, element in enumerate(elements):
+        if index > 0:
+            output_file.write(b"\n")
+        output_file.write(
+            etree.tostring(element, encoding="utf-8", pretty_print=True)
+        )
+
 
 def main() -> int:
     """Process VIAF IDs and generate XML output.
@@ -39,55 +61,58 @@ def main() -> int:
         "-o",
         dest="output_file_path",
         help="Output file",
-        type=argparse.FileType("w"),
+        type=str,
     )
     args: argparse.Namespace = parser.parse_args()
 
     viaf_ids: set[int] = set()
     for viaf_id in args.viaf_ids:
-        match = re.search(r"viaf/(\d+)", viaf_id)
-        if match is not None:
-            viaf_ids.add(int(match.group(1)))
-        else:
-            viaf_ids.add(int("".join(filter(str.isdigit, viaf_id))))
-    people: list[str] = []
-    organizations: list[str] = []
-
-    for viaf_id in viaf_ids:
-        viaf = VIAF(viaf_id)
-        element = viaf.create_element()
+        match = _VIAF_ID_RE.search(viaf_id)
+        if match is None:
+            sys.stderr.write(f"No VIAF ID found in {viaf_id}\n")
+            continue
+        viaf_ids.add(int(match.group(1) or match.group(2)))
+    people: list[etree.Element] = []
+    organizations: list[etree.Element] = []
+
+    # Fetch the VIAF records concurrently, since each one waits on the network;
+    # results come back in ID order, so the output does not vary between runs
+    elements: list[etree.Element | None] = [
+        viaf.create_element() for viaf in VIAF.bulk(sorted(viaf_ids))
+    ]
+
+    for element in elements:
         if element is None:
             continue
         if element.tag == "person":
-            people.append(
-                etree.tostring(element, encoding="unicode", pretty_print=True)
-            )
+            people.append(element)
         elif element.tag == "org":
-            organizations.append(
-                etree.tostring(element, encoding="unicode", pretty_print=True)
-            )
+            organizations.append(element)
 
     if len(people) == 0 and len(organizations) == 0:
         sys.stderr.write("No authority entries were created.\n")
         return 1
 
     # If an output file is specified, write the results to the file;
-    # otherwise, print to the console
+    # otherwise, print to the console. The file is only opened now, so an
+    # existing file is left alone if no entries were created; it is buffered
+    # in full, so that it is written in a single call
     if args.output_file_path:
-        output_file = args.output_file_path
+        output = open(args.output_file_path, "wb", buffering=1 << 20)
     else:
-        output_file = sys.stdout
+        output = contextlib.nullcontext(sys.stdout.buffer)
 
-    if len(people) > 0:
-        output_file.write("<!-- People -->\n")
-        output_file.write("\n".join(people))
+    with output as output_file:
+        if len(people) > 0:
+            output_file.write(b"<!-- People -->\n")
+            _write_elements(output_file, people)
 
-    if len(organizations) > 0:
-        output_file.write("<!-- Organizations -->\n")
-        output_file.write("\n".join(organizations))
+        if len(organizations) > 0:
+            output_file.write(b"<!-- Organizations -->\n")
+            _write_elements(output_file, organizations)
 
-    if args.output_file_path:
-        output_file.close()
+        # write the entries out before the summary that follows them
+        output_file.flush()
 
     if len(people) == 1:
         print("\nEntry created for 1 person.")
@@ -12,13 +12,26 @@ Examples:
 import argparse
 import sys
 
+from lxml import etree
+
 from tei.elements import Namespace, XMLElement
 from tei.xml import Collections, XMLFile
 
+# <binding> elements without a date attribute, looked for only in the
+# <sourceDesc> of the header, where manuscript descriptions belong
+_UNDATED_BINDING_XPATH = etree.XPath(
+    "/tei:TEI/tei:teiHeader/tei:fileDesc/tei:sourceDesc"
+    "//tei:bindingDesc/tei:binding[not(@when) and not(@notBefore)"
+    " and not(@notAfter) and not(@contemporary)]",
+    namespaces=Namespace.tei,
+)
+
 
 class Binding(XMLElement):
     """Represents a <binding> element in a TEI file."""
 
+    __slots__ = ()
+
     def add_date(self) -> bool:
         """Prompts the user to input a date or mark it as contemporary.
 
@@ -27,40 +40,44 @@ class Binding(XMLElement):
         Returns:
             bool: True if the element is modified, False if it is skipped
         """
-        # print the <binding> element text
-        print("".join(self.element.xpath("string()")).strip())
-
-        date_string: str = input(
-            "\nEnter ‘c’ for a contemporary binding, "
-            "a date range as yyyy/yyyy, or a single year as yyyy: "
-        )
-
-        match date_string.lower():
-            case "c":
-                self.element.set("contemporary", "true")
-                return True
-
-            case date_string if date_string.isdigit() and len(
-                date_string
-            ) == 4:
-                self.element.set("when", date_string)
-                return True
-
-            case date_string if "/" in date_string or "-" in date_string:
-                dates: list[str] = date_string.replace("-", "/").split("/")
-
-                if len(dates) == 2 and all(
-                    date.isdigit() and len(date) == 4 for date in dates
+        # the <binding> element text, as shown with each prompt
+        text: str = etree.tostring(
+            self.element, method="text", encoding="unicode", with_tail=False
+        ).strip()
+
+        while True:
+            print(text)
+
+            date_string: str = input(
+                "\nEnter ‘c’ for a contemporary binding, "
+                "a date range as yyyy/yyyy, or a single year as yyyy: "
+            )
+
+            match date_string.lower():
+                case "c":
+                    self.element.set("contemporary", "true")
+                    return True
+
+                case date_string if (
+                    date_string.isdigit() and len(date_string) == 4
+                ):
+                    self.element.set("when", date_string)
+                    return True
+
+                # a range is two years either side of a slash or hyphen
+                case date_string if (
+                    len(date_string) == 9
+                    and date_string[4] in "/-"
+                    and (date_string[:4] + date_string[5:]).isdigit()
                 ):
-                    self.element.set("notBefore", dates[0])
-                    self.element.set("notAfter", dates[1])
+                    self.element.set("notBefore", date_string[:4])
+                    self.element.set("notAfter", date_string[5:])
                     return True
 
-            case "":
-                return False
+                case "":
+                    return False
 
-        print("\nInvalid date format.\n")
-        return self.add_date()
+            print("\nInvalid date format.\n")
 
 
 def main() -> int:
@@ -84,19 +101,19 @@ def main() -> int:
 
     for path in Collections(args.directory).paths:
         msdesc: XMLFile = XMLFile(path)
-        # process all <binding> elements without a date attribute
-        for binding_element in msdesc.tree.xpath(
-            "//tei:binding[not(@when) and not(@notBefore)"
-            "and not(@notAfter) and not(@contemporary)]",
-            namespaces=Namespace.tei,
-        ):
-            print(f"\n{msdesc.file_path}:\n")
-            # ask the user to classify the <binding> element
-            if Binding(binding_element).add_date():
+        modified: bool = False
+        try:
+            # process all <binding> elements without a date attribute
+            for binding_element in _UNDATED_BINDING_XPATH(msdesc.tree):
+                print(f"\n{msdesc.file_path}:\n")
+                # ask the user to classify the <binding> element;
+                # if the user does not enter a date, skip the element
+                if Binding(binding_element).add_date():
+                    modified = True
+        finally:
+            # write each file once, after all of its bindings are dated
+            if modified:
                 msdesc.write()
-            # if the user does not enter a date, skip the element
-            else:
-                continue
 
     print("All files processed.")
     return 0
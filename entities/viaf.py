@@ -14,17 +14,184 @@ Example:
     >>> print(etree.tostring(element, pretty_print=True).decode("utf-8"))
 
     This will output the TEI XML element representing the VIAF entity.
+
+    To retrieve several VIAF entities at once:
+
+    >>> viafs = VIAF.bulk([34512366, 129788129])
 """
 
+import json
+import os
 import re
 import sys
+import tempfile
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from itertools import chain
+from operator import itemgetter
+from pathlib import Path
 
 import requests
 from lxml import etree
+from requests.adapters import HTTPAdapter, Retry
+
+# A hyphen after or before a digit, as in a date
+_DATE_DASH_RE = re.compile(r"(?<=\d)-|-(?=\d)")
+
+# Anything but a letter, removed from names before they are compared
+_NON_LETTERS_RE = re.compile(r"[\W\d_]+")
+
+# The XML namespace, declared on each new element, and its xml:id attribute
+_NSMAP = {"xml": "http://www.w3.org/XML/1998/namespace"}
+_XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+
+# The element for each type of name, and the element for its names
+_NAME_TAGS: dict[str, tuple[str, str]] = {
+    "Personal": ("person", "persName"),
+    "Corporate": ("org", "orgName"),
+}
+
+# Sources linked from each record: their URL templates and link titles
+_VIAF_SOURCES: dict[str, tuple[str, str]] = {
+    "BNF": ("https://data.bnf.fr/en/{id}", "BNF"),
+    "DNB": ("https://d-nb.info/gnd/{id}", "GND"),
+    "ISNI": ("https://isni.org/isni/{id}", "ISNI"),
+    "LC": ("https://id.loc.gov/authorities/names/{id}", "LC"),
+    "WKP": ("https://wikidata.org/wiki/{id}", "Wikidata"),
+}
+
+# Sources of display headings, from the most to the least preferred
+_DISPLAY_SOURCES: tuple[frozenset[str], ...] = (
+    frozenset({"LC"}),
+    frozenset({"DNB"}),
+    frozenset({"BNF", "SUDOC", "BIBSYS", "NTA", "JPG"}),
+)
+
+# Sources whose structured headings and variants are encoded as names
+_STRUCTURED_SOURCES = frozenset({"LC", "DNB", "BNF", "BAV", "JPG"})
+
+# The number of VIAF records to fetch at once, and of connections to keep
+_MAX_WORKERS = 16
+
+
+def _create_session() -> requests.Session:
+    """Create a session for VIAF requests.
+
+    Connections are kept alive and reused, with a pool large enough for
+    concurrent lookups. Requests that are rate limited or meet a temporary
+    server error are retried with a short backoff.
+
+    Returns:
+        requests.Session: The session.
+    """
+    session = requests.Session()
+    session.headers["Accept"] = "application/json"
+    session.headers["User-Agent"] = (
+        "tei-msdesc-tools (https://github.com/adunning/tei-msdesc-tools)"
+    )
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_maxsize=_MAX_WORKERS,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+            ),
+        ),
+    )
+    return session
+
+
+# Share one session so that connections to VIAF are kept alive and reused
+_SESSION = _create_session()
+
+
+# Cache VIAF responses on disk so that repeated runs do not fetch them again
+_CACHE_DIR = Path(
+    os.environ.get("VIAF_CACHE_DIR")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "tei-msdesc-tools"
+    / "viaf"
+)
+_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # seconds
+
+
+def _as_list(value: dict | list[dict]) -> list[dict]:
+    """Return a VIAF JSON value as a list, since single items are not lists.
+
+    Args:
+        value (dict | list[dict]): A single item, or a list of them.
+
+    Returns:
+        list[dict]: The items, without changing the JSON.
+    """
+    return [value] if isinstance(value, dict) else value
+
 
+def _source_codes(sources: str | list[str]) -> tuple[str, ...]:
+    """Return the codes of the sources of a VIAF field as a tuple.
 
-@dataclass
+    Args:
+        sources (str | list[str]): A single source code, or a list of them.
+
+    Returns:
+        tuple[str, ...]: The source codes, in their original order.
+    """
+    return (sources,) if isinstance(sources, str) else tuple(sources)
+
+
+def _parse_datafield(heading: dict) -> dict:
+    """Parse a structured heading or name variant from its MARC datafield.
+
+    Args:
+        heading (dict): A VIAF heading, with its datafield and sources.
+
+    Returns:
+        dict: The datafield's type, indicators, tag and sources, and its
+            subfields with any trailing full stop or comma removed.
+    """
+    datafield = heading["datafield"]
+    return {
+        "dtype": datafield["@dtype"],
+        "ind1": datafield["@ind1"],
+        "ind2": datafield["@ind2"],
+        "tag": datafield["@tag"],
+        "subfields": [
+            {
+                "code": subfield["@code"],
+                "text": (
+                    subfield["#text"][:-1]
+                    if subfield["#text"].endswith((".", ","))
+                    else subfield["#text"]
+                ),
+            }
+            for subfield in _as_list(datafield["subfield"])
+        ],
+        "sources": _source_codes(heading["sources"]["s"]),
+    }
+
+
+def _display_rank(heading: dict) -> tuple[int, int]:
+    """Rank a main heading as a display heading; lower ranks are preferred.
+
+    Args:
+        heading (dict): A main heading, with its text and sources.
+
+    Returns:
+        tuple[int, int]: The rank of the heading's most preferred source,
+            and, if it has none, the negated number of its sources.
+    """
+    sources = heading["sources"]
+    for rank, preferred_sources in enumerate(_DISPLAY_SOURCES):
+        if not preferred_sources.isdisjoint(sources):
+            return rank, 0
+    return len(_DISPLAY_SOURCES), -len(sources)
+
+
+@dataclass(slots=True)
 class VIAF:
     """Represents a VIAF entity.
 
@@ -38,9 +205,12 @@ class VIAF:
         birth_date (str): The birth date of the entity.
         death_date (str): The death date of the entity.
         date_type (str): The type of date (lived, circa, or flourished).
+        data (dict | None): The VIAF JSON, or None if it could not be read.
 
     Methods:
-        fetch_data: Retrieves data from VIAF API based on the VIAF ID.
+        bulk: Retrieves several VIAF entities concurrently.
+        fetch_data: Retrieves data from VIAF API based on the VIAF ID,
+            using the on-disk cache where possible.
         format_date: Formats the date by adding leading zeroes to the year
             if less than 4 digits.
         parse_data: Parses the data retrieved from the VIAF API.
@@ -60,65 +230,124 @@ class VIAF:
     languages: list[dict[str, str]] = field(default_factory=list)
     nationalities: list[dict[str, str]] = field(default_factory=list)
     occupations: list[dict[str, str]] = field(default_factory=list)
+    data: dict | None = field(default=None, repr=False)
 
     def __post_init__(self):
         """Initialize the VIAF entity based on the VIAF ID."""
-        if not re.match(r"[1-9]\d(\d{0,7}|\d{17,20})", str(self.viaf_id)):
-            sys.stderr.write("VIAF ID is invalid.")
+        # VIAF IDs have two to nine digits, or nineteen to twenty-two
+        viaf_id = self.viaf_id
+        if not isinstance(viaf_id, int) or not (
+            10 <= viaf_id <= 999_999_999 or 10**18 <= viaf_id < 10**22
+        ):
+            sys.stderr.write(f"VIAF ID is invalid: {viaf_id}\n")
+            self.data = None
             return
         self.data = self.fetch_data()
         self.parse_data()
 
+    @classmethod
+    def bulk(
+        cls, viaf_ids: Iterable[int], max_workers: int = _MAX_WORKERS
+    ) -> list["VIAF"]:
+        """Retrieve several VIAF entities concurrently.
+
+        Each entity waits on the network, so they are fetched in a pool of
+        threads sharing the session's connections.
+
+        Args:
+            viaf_ids (Iterable[int]): The VIAF IDs.
+            max_workers (int): The number of entities to fetch at once,
+                by default _MAX_WORKERS, the number of connections the
+                session keeps open for reuse.
+
+        Returns:
+            list[VIAF]: The VIAF entities, in the order of their IDs.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(cls, viaf_ids))
+
     def fetch_data(self) -> dict[str, str] | None:
         """Retrieve data from VIAF JSON based on the VIAF ID."""
-        url = f"https://www.viaf.org/viaf/{self.viaf_id}/viaf.json"
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            if (
-                response.json().get("ns0")
-                == "http://viaf.org/viaf/abandonedViafRecord"
-            ):
-                if response.json()["scavenged"]:
+        data = self._read_cache()
+        if data is None:
+            url = f"https://www.viaf.org/viaf/{self.viaf_id}/viaf.json"
+            try:
+                response = _SESSION.get(url, timeout=10)
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException as err:
+                # there is no response if the connection itself failed
+                if (
+                    err.response is not None
+                    and err.response.status_code == 404
+                ):
                     sys.stderr.write(
-                        f"VIAF ID {self.viaf_id} is a deleted record.\n"
+                        f"VIAF ID does not exist: {self.viaf_id}\n"
                     )
                     self.viaf_id = None
-                    return None
-                elif response.json()["redirect"]:
-                    sys.stderr.write(
-                        f"VIAF ID {self.viaf_id} is a redirect to "
-                        f"{response.json()["redirect"]["directto"]}.\n"
-                    )
-                    self.viaf_id = int(response.json()["redirect"]["directto"])
-                    return self.fetch_data()
-
-            return response.json()
-        except requests.exceptions.RequestException as err:
-            if response.status_code == 404:
-                sys.stderr.write(f"VIAF ID does not exist: {self.viaf_id}\n")
+                else:
+                    sys.stderr.write(f"Request Exception: {err}\n")
+                return None
+            self._write_cache(data)
+
+        if data.get("ns0") == "http://viaf.org/viaf/abandonedViafRecord":
+            if data["scavenged"]:
+                sys.stderr.write(
+                    f"VIAF ID {self.viaf_id} is a deleted record.\n"
+                )
                 self.viaf_id = None
-            else:
-                sys.stderr.write(f"Request Exception: {err}")
+                return None
+            elif data["redirect"]:
+                sys.stderr.write(
+                    f"VIAF ID {self.viaf_id} is a redirect to "
+                    f"{data['redirect']['directto']}.\n"
+                )
+                self.viaf_id = int(data["redirect"]["directto"])
+                return self.fetch_data()
 
-        return None
+        return data
+
+    def _read_cache(self) -> dict[str, str] | None:
+        """Return the cached VIAF JSON for the VIAF ID, if it is fresh."""
+        path = _CACHE_DIR / f"{self.viaf_id}.json"
+        try:
+            if time.time() - path.stat().st_mtime > _CACHE_MAX_AGE:
+                return None
+            with path.open(encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, data: dict[str, str]) -> None:
+        """Save the VIAF JSON for the VIAF ID to the cache."""
+        # write to a temporary file and move it into place, so that a
+        # concurrent or interrupted run never reads a partial record
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=_CACHE_DIR,
+                suffix=".tmp",
+                delete=False,
+            ) as file:
+                json.dump(data, file)
+            os.replace(file.name, _CACHE_DIR / f"{self.viaf_id}.json")
+        except OSError as err:
+            sys.stderr.write(
+                f"Could not cache VIAF ID {self.viaf_id}: {err}\n"
+            )
 
     def format_date(self, date: str) -> str | None:
         """Ensure that the year is 4 digits long for ISO 8601."""
         if date == "0000" or date == "0":
             return None
-        elif date.startswith("-"):
-            date = re.sub(
-                r"^(-?\d+)(-|$)",
-                lambda match: match.group(1).zfill(5) + match.group(2),
-                date,
-            )
-        else:
-            date = re.sub(
-                r"^(\d+)(-|$)",
-                lambda match: match.group(1).zfill(4) + match.group(2),
-                date,
-            )
+
+        # pad the year, before any month and day, keeping a leading minus
+        sign: str = "-" if date.startswith("-") else ""
+        year, separator, rest = date[len(sign) :].partition("-")
+        if year.isdecimal():
+            date = f"{sign}{year.zfill(4)}{separator}{rest}"
         return date
 
     def parse_data(self):
@@ -126,117 +355,59 @@ class VIAF:
         if self.data is None:
             return
 
-        self.name_type = self.data["nameType"]
+        # Bind the response and its sections once
+        data = self.data
+        sources = data.get("sources")
+        main_headings = data.get("mainHeadings")
+        x400s = data.get("x400s")
+
+        self.name_type = data["nameType"]
 
-        if self.data.get("sources"):
-            # If there is only one source, convert it to a list
-            if isinstance(self.data.get("sources")["source"], dict):
-                self.data.get("sources")["source"] = [
-                    self.data.get("sources").get("source")
-                ]
-            for source in self.data.get("sources")["source"]:
+        # Only persons and organizations are used to create elements
+        if self.name_type not in _NAME_TAGS:
+            return
+
+        if sources:
+            for source in _as_list(sources["source"]):
                 # Split the source name and ID on the pipe character
                 source_name, source_id = source["#text"].split("|")
                 # Remove spaces from the source ID
                 source_id = source_id.replace(" ", "")
                 self.sources.append({"name": source_name, "id": source_id})
 
-        if self.data.get("mainHeadings"):
-            if isinstance(self.data.get("mainHeadings")["data"], dict):
-                self.data.get("mainHeadings")["data"] = [
-                    self.data.get("mainHeadings").get("data")
-                ]
-            for heading in self.data.get("mainHeadings")["data"]:
-                # Remove repeated spaces
-                heading["text"] = re.sub(r"\s+", " ", heading["text"])
+        if main_headings:
+            for heading in _as_list(main_headings["data"]):
+                # Remove repeated and surrounding spaces
+                text: str = " ".join(heading["text"].split())
 
                 # Replace hyphens with en dashes in dates
-                heading["text"] = re.sub(r"(\d+)-", r"\1–", heading["text"])
-                heading["text"] = re.sub(r"-(\d+)", r"–\1", heading["text"])
+                text = _DATE_DASH_RE.sub("–", text)
 
                 # Remove any trailing full stop
-                if heading["text"].endswith("."):
-                    heading["text"] = heading["text"][:-1]
+                if text.endswith("."):
+                    text = text[:-1]
 
                 self.headings.append(
                     {
-                        "text": heading["text"],
-                        "sources": heading["sources"]["s"],
+                        "text": text,
+                        "sources": _source_codes(heading["sources"]["s"]),
                     }
                 )
 
-        if self.data.get("mainHeadings")["mainHeadingEl"]:
-            if isinstance(
-                self.data.get("mainHeadings")["mainHeadingEl"], dict
-            ):
-                self.data.get("mainHeadings")["mainHeadingEl"] = [
-                    self.data.get("mainHeadings")["mainHeadingEl"]
-                ]
-            for heading in self.data.get("mainHeadings")["mainHeadingEl"]:
-                for subfield in heading["datafield"]["subfield"]:
-                    if isinstance(heading["datafield"]["subfield"], dict):
-                        heading["datafield"]["subfield"] = [
-                            heading["datafield"]["subfield"]
-                        ]
-                # Remove trailing punctuation from subfields
-                for subfield in heading["datafield"]["subfield"]:
-                    if subfield["#text"].endswith((".", ",")):
-                        subfield["#text"] = subfield["#text"][:-1]
-                self.headings_structured.append(
-                    {
-                        "dtype": heading["datafield"]["@dtype"],
-                        "ind1": heading["datafield"]["@ind1"],
-                        "ind2": heading["datafield"]["@ind2"],
-                        "tag": heading["datafield"]["@tag"],
-                        "subfields": [
-                            {
-                                "code": subfield["@code"],
-                                "text": subfield["#text"],
-                            }
-                            for subfield in heading["datafield"]["subfield"]
-                        ],
-                        "sources": heading["sources"]["s"],
-                    }
-                )
+        if main_headings and main_headings.get("mainHeadingEl"):
+            for heading in _as_list(main_headings["mainHeadingEl"]):
+                self.headings_structured.append(_parse_datafield(heading))
 
-        if self.data.get("x400s"):
-            if isinstance(self.data.get("x400s")["x400"], dict):
-                self.data.get("x400s")["x400"] = [
-                    self.data.get("x400s").get("x400")
-                ]
-            for heading in self.data.get("x400s")["x400"]:
-                for subfield in heading["datafield"]["subfield"]:
-                    if isinstance(heading["datafield"]["subfield"], dict):
-                        heading["datafield"]["subfield"] = [
-                            heading["datafield"]["subfield"]
-                        ]
-                # Remove trailing punctuation from subfields
-                for subfield in heading["datafield"]["subfield"]:
-                    if subfield["#text"].endswith((".", ",")):
-                        subfield["#text"] = subfield["#text"][:-1]
-                self.name_variants.append(
-                    {
-                        "dtype": heading["datafield"]["@dtype"],
-                        "ind1": heading["datafield"]["@ind1"],
-                        "ind2": heading["datafield"]["@ind2"],
-                        "tag": heading["datafield"]["@tag"],
-                        "subfields": [
-                            {
-                                "code": subfield["@code"],
-                                "text": subfield["#text"],
-                            }
-                            for subfield in heading["datafield"]["subfield"]
-                        ],
-                        "sources": heading["sources"]["s"],
-                    }
-                )
+        if x400s:
+            for heading in _as_list(x400s["x400"]):
+                self.name_variants.append(_parse_datafield(heading))
 
         # Format the birth and death dates for ISO 8601
-        self.birth_date = self.format_date(self.data["birthDate"])
-        self.death_date = self.format_date(self.data["deathDate"])
-        self.date_type = self.data["dateType"]
+        self.birth_date = self.format_date(data["birthDate"])
+        self.death_date = self.format_date(data["deathDate"])
+        self.date_type = data["dateType"]
 
-        gender_type = self.data["fixed"]["gender"]
+        gender_type = data["fixed"]["gender"]
         if gender_type == "a":
             gender_type = "female"
         elif gender_type == "b":
@@ -245,42 +416,33 @@ class VIAF:
             gender_type = None
         self.gender = gender_type
 
-        if self.data.get("languageOfEntity"):
-            if isinstance(self.data.get("languageOfEntity")["data"], dict):
-                self.data.get("languageOfEntity")["data"] = [
-                    self.data.get("languageOfEntity").get("data")
-                ]
-            for language in self.data["languageOfEntity"]["data"]:
+        languages = data.get("languageOfEntity")
+        if languages:
+            for language in _as_list(languages["data"]):
                 self.languages.append(
                     {
                         "language": language["text"],
-                        "sources": language["sources"]["s"],
+                        "sources": _source_codes(language["sources"]["s"]),
                     }
                 )
 
-        if self.data.get("nationalityOfEntity"):
-            if isinstance(self.data.get("nationalityOfEntity")["data"], dict):
-                self.data.get("nationalityOfEntity")["data"] = [
-                    self.data.get("nationalityOfEntity").get("data")
-                ]
-            for nationality in self.data["nationalityOfEntity"]["data"]:
+        nationalities = data.get("nationalityOfEntity")
+        if nationalities:
+            for nationality in _as_list(nationalities["data"]):
                 self.nationalities.append(
                     {
                         "nationality": nationality["text"],
-                        "sources": nationality["sources"]["s"],
+                        "sources": _source_codes(nationality["sources"]["s"]),
                     }
                 )
 
-        if self.data.get("occupation"):
-            if isinstance(self.data.get("occupation")["data"], dict):
-                self.data.get("occupation")["data"] = [
-                    self.data.get("occupation").get("data")
-                ]
-            for occupation in self.data["occupation"]["data"]:
+        occupations = data.get("occupation")
+        if occupations:
+            for occupation in _as_list(occupations["data"]):
                 self.occupations.append(
                     {
                         "occupation": occupation["text"],
-                        "sources": occupation["sources"]["s"],
+                        "sources": _source_codes(occupation["sources"]["s"]),
                     }
                 )
 
@@ -294,178 +456,132 @@ class VIAF:
         if self.data is None:
             return None
 
-        # Create the element
-        if self.name_type == "Personal":
-            element_name: str = "person"
-            element_id: str = f"person_{self.viaf_id}"
-        elif self.name_type == "Corporate":
-            element_name = "org"
-            element_id = f"org_{self.viaf_id}"
+        # Create the element, if the entity is a person or an organization
+        name_tags = _NAME_TAGS.get(self.name_type)
+        if name_tags is None:
+            return None
+        element_name, name_tag = name_tags
 
-        # Set the element id
+        # Create the element with its id
         element = etree.Element(
-            element_name, nsmap={"xml": "http://www.w3.org/XML/1998/namespace"}
-        )
-        element.set("{http://www.w3.org/XML/1998/namespace}id", element_id)
-
-        # Find a display heading by looking for a preferred source
-        display_heading = next(
-            (
-                heading
-                for heading in self.headings
-                if "LC" in heading["sources"]
-            ),
-            None,
+            element_name,
+            attrib={_XML_ID: f"{element_name}_{self.viaf_id}"},
+            nsmap=_NSMAP,
         )
-        if display_heading is None:
-            display_heading = next(
-                (
-                    heading
-                    for heading in self.headings
-                    if "DNB" in heading["sources"]
-                ),
-                None,
-            )
-        if display_heading is None:
-            display_heading = next(
-                (
-                    heading
-                    for heading in self.headings
-                    if "BNF" in heading["sources"]
-                    or "SUDOC" in heading["sources"]
-                    or "BIBSYS" in heading["sources"]
-                    or "NTA" in heading["sources"]
-                    or "JPG" in heading["sources"]
-                ),
-                None,
-            )
-        # If there is no preferred source, use the one with the most sources
-        if display_heading is None:
-            display_heading = max(
-                self.headings, key=lambda heading: len(heading["sources"])
-            )
-        # If there is still no display heading, use the first one
-        if display_heading is None:
-            display_heading = self.headings[0]
+
+        # Find a display heading in one pass: the first from the most
+        # preferred source, or else the one with the most sources
+        display_heading = min(self.headings, key=_display_rank)
 
         # Add the display heading to the element
-        if element_name == "person":
-            display_element = etree.SubElement(element, "persName")
-        elif element_name == "org":
-            display_element = etree.SubElement(element, "orgName")
-        display_element.set(
-            "source",
-            " ".join(display_heading["sources"])
-            if isinstance(display_heading["sources"], list)
-            else display_heading["sources"],
+        display_element = etree.SubElement(
+            element,
+            name_tag,
+            attrib={
+                "source": " ".join(display_heading["sources"]),
+                "type": "display",
+            },
         )
-        display_element.set("type", "display")
         display_element.text = display_heading["text"]
 
         # Create filtered lists of the structured headings and name variants
         headings_preferred = [
             heading
             for heading in self.headings_structured
-            if any(
-                source in heading["sources"]
-                for source in ["LC", "DNB", "BNF", "BAV", "JPG"]
-            )
+            if not _STRUCTURED_SOURCES.isdisjoint(heading["sources"])
         ]
         variants_preferred = [
             variant
             for variant in self.name_variants
-            if any(
-                source in variant["sources"]
-                for source in ["LC", "DNB", "BNF", "BAV", "JPG"]
-            )
+            if not _STRUCTURED_SOURCES.isdisjoint(variant["sources"])
         ]
 
-        # Add a normalized string to each list from the subfields
-        for heading in headings_preferred + variants_preferred:
-            heading["normalized"] = " ".join(
-                subfield["text"]
-                for subfield in heading["subfields"]
-                if subfield["code"].isalpha()
-            ).strip()
-
-        for heading in headings_preferred + variants_preferred:
-            heading["normalized"] = "".join(
-                char for char in heading["normalized"] if char.isalpha()
+        # Add a normalized string to each heading and variant from its
+        # subfields, keeping the first of each as the structured names
+        structured_names: dict[str, dict] = {}
+        for heading in chain(headings_preferred, variants_preferred):
+            heading["normalized"] = _NON_LETTERS_RE.sub(
+                "",
+                "".join(
+                    subfield["text"]
+                    for subfield in heading["subfields"]
+                    if subfield["code"].isalpha()
+                ),
             )
-
-        # Deduplicate headings_preferred as structured_names
-        structured_names = []
-        normalized_strings = set()
-        for heading in headings_preferred:
-            normalized_string = heading["normalized"]
-            if normalized_string not in normalized_strings:
-                structured_names.append(heading)
-                normalized_strings.add(normalized_string)
-        # Add the name variants to the structured names
-        for variant in variants_preferred:
-            normalized_string = variant["normalized"]
-            if normalized_string not in normalized_strings:
-                structured_names.append(variant)
-                normalized_strings.add(normalized_string)
+            structured_names.setdefault(heading["normalized"], heading)
 
         # Encode structured name variants
-        for name in structured_names:
-            if element_name == "person":
-                variant_element = etree.SubElement(element, "persName")
-            elif element_name == "org":
-                variant_element = etree.SubElement(element, "orgName")
-            variant_element.set(
-                "source",
-                " ".join(name["sources"])
-                if isinstance(name["sources"], list)
-                else name["sources"],
-            )
-            variant_element.set("type", "variant")
+        for name in structured_names.values():
+            variant_attrib = {
+                "source": " ".join(name["sources"]),
+                "type": "variant",
+            }
             if name["ind1"] == "0":
-                variant_element.set("subtype", "forenameFirst")
+                variant_attrib["subtype"] = "forenameFirst"
             elif name["ind1"] == "1":
-                variant_element.set("subtype", "surnameFirst")
+                variant_attrib["subtype"] = "surnameFirst"
+            variant_element = etree.SubElement(
+                element, name_tag, attrib=variant_attrib
+            )
             # print each of the subfields within a <name> element
             for subfield in name["subfields"]:
                 if not subfield["code"].isalpha():
                     continue
-                name_element = etree.SubElement(variant_element, "name")
-                name_element.set("type", f"marc-{subfield["code"]}")
+                name_element = etree.SubElement(
+                    variant_element,
+                    "name",
+                    attrib={"type": f"marc-{subfield['code']}"},
+                )
                 name_element.text = subfield["text"]
 
         # Set the birth and death dates
         if self.date_type == "lived":
             if self.birth_date:
-                birth_element = etree.SubElement(element, "birth")
-                birth_element.set("source", "VIAF")
-                birth_element.set("when", self.birth_date)
+                etree.SubElement(
+                    element,
+                    "birth",
+                    attrib={"source": "VIAF", "when": self.birth_date},
+                )
             if self.death_date:
-                death_element = etree.SubElement(element, "death")
-                death_element.set("source", "VIAF")
-                death_element.set("when", self.death_date)
+                etree.SubElement(
+                    element,
+                    "death",
+                    attrib={"source": "VIAF", "when": self.death_date},
+                )
         elif self.date_type == "circa":
             if self.birth_date:
-                birth_element = etree.SubElement(element, "birth")
-                birth_element.set("cert", "low")
-                birth_element.set("source", "VIAF")
-                birth_element.set("when", self.birth_date)
+                etree.SubElement(
+                    element,
+                    "birth",
+                    attrib={
+                        "cert": "low",
+                        "source": "VIAF",
+                        "when": self.birth_date,
+                    },
+                )
             if self.death_date:
-                death_element = etree.SubElement(element, "death")
-                death_element.set("cert", "low")
-                death_element.set("source", "VIAF")
-                death_element.set("when", self.death_date)
+                etree.SubElement(
+                    element,
+                    "death",
+                    attrib={
+                        "cert": "low",
+                        "source": "VIAF",
+                        "when": self.death_date,
+                    },
+                )
         elif self.date_type == "flourished":
-            flourished_element = etree.SubElement(element, "floruit")
-            flourished_element.set("source", "VIAF")
+            floruit_attrib = {"source": "VIAF"}
             if self.birth_date:
-                flourished_element.set("notBefore", self.birth_date)
+                floruit_attrib["notBefore"] = self.birth_date
             if self.death_date:
-                flourished_element.set("notAfter", self.death_date)
+                floruit_attrib["notAfter"] = self.death_date
+            etree.SubElement(element, "floruit", attrib=floruit_attrib)
 
         if element_name == "person":
             if self.gender:
-                sex_element = etree.SubElement(element, "sex")
-                sex_element.set("source", "VIAF")
+                sex_element = etree.SubElement(
+                    element, "sex", attrib={"source": "VIAF"}
+                )
                 sex_element.text = self.gender
 
             if self.languages:
@@ -473,90 +589,55 @@ class VIAF:
                     element, "langKnowledge"
                 )
                 for language in self.languages:
-                    lang_known_element = etree.SubElement(
-                        lang_knowledge_element, "langKnown"
-                    )
-                    lang_known_element.set(
-                        "source",
-                        " ".join(language["sources"])
-                        if isinstance(language["sources"], list)
-                        else language["sources"],
+                    etree.SubElement(
+                        lang_knowledge_element,
+                        "langKnown",
+                        attrib={
+                            "source": " ".join(language["sources"]),
+                            "tag": language["language"],
+                        },
                     )
-                    lang_known_element.set("tag", language["language"])
 
             if self.nationalities:
                 for nationality in self.nationalities:
                     nationality_element = etree.SubElement(
-                        element, "nationality"
-                    )
-                    nationality_element.set(
-                        "source",
-                        " ".join(nationality["sources"])
-                        if isinstance(nationality["sources"], list)
-                        else nationality["sources"],
+                        element,
+                        "nationality",
+                        attrib={"source": " ".join(nationality["sources"])},
                     )
                     nationality_element.text = nationality["nationality"]
 
             if self.occupations:
                 for occupation in self.occupations:
                     occupation_element = etree.SubElement(
-                        element, "occupation"
-                    )
-                    occupation_element.set(
-                        "source",
-                        " ".join(occupation["sources"])
-                        if isinstance(occupation["sources"], list)
-                        else occupation["sources"],
+                        element,
+                        "occupation",
+                        attrib={"source": " ".join(occupation["sources"])},
                     )
                     occupation_element.text = occupation["occupation"]
 
         # Create a list of links
-        note = etree.SubElement(element, "note")
-        note.set("type", "links")
-        link_list = etree.SubElement(note, "list")
-        link_list.set("type", "links")
+        note = etree.SubElement(element, "note", attrib={"type": "links"})
+        link_list = etree.SubElement(note, "list", attrib={"type": "links"})
 
+        # Collect the links as (title, URL) pairs, ending with VIAF itself
+        links: list[tuple[str, str]] = []
         for source in self.sources:
-            viaf_sources = {
-                "BNF": {
-                    "url": f"https://data.bnf.fr/en/{source["id"]}",
-                    "title": "BNF",
-                },
-                "DNB": {
-                    "url": f"https://d-nb.info/gnd/{source["id"]}",
-                    "title": "GND",
-                },
-                "ISNI": {
-                    "url": f"https://isni.org/isni/{source["id"]}",
-                    "title": "ISNI",
-                },
-                "LC": {
-                    "url": "https://id.loc.gov/authorities/names/"
-                    + f"{source["id"]}",
-                    "title": "LC",
-                },
-                "WKP": {
-                    "url": f"https://wikidata.org/wiki/{source["id"]}",
-                    "title": "Wikidata",
-                },
-            }
-
-            if source["name"] in viaf_sources:
-                item = etree.SubElement(link_list, "item")
-                ref = etree.SubElement(item, "ref")
-                ref.set("target", viaf_sources[source["name"]]["url"])
-                title = etree.SubElement(ref, "title")
-                title.text = viaf_sources[source["name"]]["title"]
-
-        viaf_item = etree.SubElement(link_list, "item")
-        viaf_ref = etree.SubElement(viaf_item, "ref")
-        viaf_ref.set("target", f"https://viaf.org/viaf/{self.viaf_id}")
-        viaf_title = etree.SubElement(viaf_ref, "title")
-        viaf_title.text = "VIAF"
-
-        # Sort the resulting list of links by title
-        link_list[:] = sorted(
-            link_list, key=lambda item: item[0][0].text or ""
-        )
+            link = _VIAF_SOURCES.get(source["name"])
+            if link is not None:
+                url_template, link_title = link
+                links.append(
+                    (link_title, url_template.format(id=source["id"]))
+                )
+        links.append(("VIAF", f"https://viaf.org/viaf/{self.viaf_id}"))
+
+        # Add the links sorted by title, keeping sources with the same title
+        # in their original order
+        links.sort(key=itemgetter(0))
+        for link_title, url in links:
+            item = etree.SubElement(link_list, "item")
+            ref = etree.SubElement(item, "ref", attrib={"target": url})
+            title = etree.SubElement(ref, "title")
+            title.text = link_title
 
         return element
@@ -17,13 +17,50 @@ Examples:
 
 import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from lxml import etree
 
-from entities.viaf import VIAF
 from tei.elements import Namespace
 from tei.xml import AuthorityFile, Collections, MSDesc
 
+# The authority keys, set once in each worker process by _init_worker
+_authority_keys: frozenset[str] = frozenset()
+
+
+def _init_worker(authority_keys: frozenset[str]) -> None:
+    """Keep the authority keys for the lifetime of a worker process.
+
+    Args:
+        authority_keys (frozenset[str]): All keys in the authority files.
+    """
+    global _authority_keys
+    _authority_keys = authority_keys
+
+
+def _stream_keys(path: str) -> list[str]:
+    """Read the keys in a single authority file.
+
+    Args:
+        path (str): Path to a TEI XML authority file.
+
+    Returns:
+        list[str]: The xml:id attributes of the entities in the file.
+    """
+    return list(AuthorityFile.stream_keys(path))
+
+
+def _check_keys(path: str) -> set[str]:
+    """Check the @key references in a single manuscript description.
+
+    Args:
+        path (str): Path to a TEI XML manuscript description.
+
+    Returns:
+        set[str]: Keys in the manuscript description not in the authorities.
+    """
+    return MSDesc(path).check_keys(_authority_keys)
+
 
 def main() -> int:
     """Manage entities in TEI XML manuscript descriptions.
@@ -60,7 +97,7 @@ def main() -> int:
         "--places",
         dest="places_file",
         nargs="*",
-        default="../medieval-mss/places.xml",
+        default=["../medieval-mss/places.xml"],
         help="TEI XML file containing <place> elements",
         type=str,
     )
@@ -152,7 +189,7 @@ def main() -> int:
         "--works",
         dest="works_file",
         nargs="*",
-        default="../medieval-mss/works.xml",
+        default=["../medieval-mss/works.xml"],
         help="TEI XML file containing the <bibl> elements",
         type=str,
     )
@@ -176,71 +213,108 @@ def main() -> int:
     # )
     args: argparse.Namespace = parser.parse_args()
 
-    # Create a set of all keys in the authority files
-    authority_keys: set[str] = set()
-    authority_paths: list[str] = [
-        args.organizations_file,
-        args.persons_file,
-        args.places_file,
-        args.works_file,
-    ]
-    for authority_path in authority_paths:
-        authority_keys |= AuthorityFile(authority_path).keys
-
-    # Create a set of keys in the manuscript descriptions not in authorities
-    missing_keys: set[str] = {
-        key
-        for path in Collections(args.collections_path).paths
-        for key in MSDesc(path).check_keys(authority_keys)
-    }
-
-    # Create a set of likely VIAF IDs from person and organization keys
-    viaf_ids: set[int] = set()
+    # Create a set of all keys in the authority files, reading the
+    # independent files concurrently so that their I/O overlaps
+    # (organizations are kept in places.xml by default, so each file is
+    # listed only once, and several places or works files may be given)
+    authority_paths: list[str] = list(
+        dict.fromkeys(
+            [
+                args.organizations_file,
+                args.persons_file,
+                *args.places_file,
+                *args.works_file,
+            ]
+        )
+    )
+    with ThreadPoolExecutor(max_workers=len(authority_paths)) as executor:
+        authority_keys: frozenset[str] = frozenset().union(
+            *executor.map(_stream_keys, authority_paths)
+        )
+
+    # Read the manuscript descriptions in inode order, which tends to follow
+    # their layout on disk and so suits the operating system's read-ahead
+    msdesc_paths: list[str] = Collections(args.collections_path).paths_by_inode
+
+    # Create a set of keys in the manuscript descriptions not in authorities,
+    # checking the files in parallel; the authority keys are sent to each
+    # worker once, rather than with every batch of files
+    missing_keys: set[str] = set()
+    with ProcessPoolExecutor(
+        initializer=_init_worker, initargs=(authority_keys,)
+    ) as executor:
+        for file_missing_keys in executor.map(
+            _check_keys, msdesc_paths, chunksize=8
+        ):
+            missing_keys |= file_missing_keys
+
+    # Map likely VIAF IDs from person and organization keys to the kinds of
+    # element they are referenced as; other keys cannot be found in VIAF
+    viaf_ids: dict[int, set[str]] = {}
     if missing_keys and not args.validate_only:
-        viaf_ids = {int(key.split("_")[-1]) for key in missing_keys}
+        for key in missing_keys:
+            prefix, _, number = key.rpartition("_")
+            if prefix in ("person", "org") and number.isdigit():
+                viaf_ids.setdefault(int(number), set()).add(prefix)
 
     # Attempt to add missing VIAF records
     new_authority_keys: set[str] = set()
     persons_modified, organizations_modified = False, False
     if viaf_ids:
-        # Open the authority files
+        # Import VIAF only when it is needed, since loading requests
+        # accounts for most of the start-up time of a validation run
+        from entities.viaf import VIAF
+
+        # Open the authority files, sharing one tree if they are the same file
         persons = AuthorityFile(args.persons_file)
-        organizations = AuthorityFile(args.organizations_file)
+        organizations = (
+            persons
+            if args.organizations_file == args.persons_file
+            else AuthorityFile(args.organizations_file)
+        )
+
+        # Compile the container expressions once for every new record
+        person_viaf_xpath = etree.XPath(
+            args.persons_viaf_xpath, namespaces=Namespace.tei
+        )
+        organization_viaf_xpath = etree.XPath(
+            args.organizations_viaf_xpath, namespaces=Namespace.tei
+        )
 
-        # Look for new VIAF records
-        for viaf_id in viaf_ids:
-            viaf = VIAF(viaf_id)
-            element = viaf.create_element()
-            if element is None:
+        # Look for new VIAF records, fetching them concurrently and then
+        # adding them one at a time, since lxml trees are not thread-safe
+        sorted_viaf_ids: list[int] = sorted(viaf_ids)
+        elements = [
+            viaf.create_element() for viaf in VIAF.bulk(sorted_viaf_ids)
+        ]
+        for viaf_id, element in zip(sorted_viaf_ids, elements):
+            # skip records that are not of the kind the key refers to
+            if element is None or element.tag not in viaf_ids[viaf_id]:
                 continue
 
             if element.tag == "person":
-                viaf_container = persons.tree.xpath(
-                    args.persons_viaf_xpath, namespaces=Namespace.tei
-                )[0]
+                viaf_container = person_viaf_xpath(persons.tree)[0]
                 viaf_container.append(element)
-                persons.write()
                 persons_modified = True
                 new_authority_keys.add(
                     element.attrib["{http://www.w3.org/XML/1998/namespace}id"]
                 )
 
             elif element.tag == "org":
-                viaf_container = organizations.tree.xpath(
-                    args.organizations_viaf_xpath, namespaces=Namespace.tei
-                )[0]
+                viaf_container = organization_viaf_xpath(organizations.tree)[0]
                 viaf_container.append(element)
-                organizations.write()
                 organizations_modified = True
                 new_authority_keys.add(
                     element.attrib["{http://www.w3.org/XML/1998/namespace}id"]
                 )
 
-    # Reindent the authority files
+    # Reindent and write each modified authority file once
     if persons_modified:
         etree.indent(persons.tree, space="   ")
         persons.write()
-    if organizations_modified:
+    if organizations_modified and not (
+        persons_modified and organizations is persons
+    ):
         etree.indent(organizations.tree, space="   ")
         organizations.write()
 
@@ -9,11 +9,7 @@ Classes:
 Examples:
     To create a <category> element:
 
-    >>> category = Category(
-    ...     etree.Element("category", id="person"),
-    ...     "person",
-    ...     "A human being.",
-    ... )
+    >>> category = Category(etree.Element("category", id="person"))
     >>> print(category.category_description)
 
     To create a <bibl> element:
@@ -29,8 +25,6 @@ Examples:
     `<bibl id="work-001"><term ref="#person"/></bibl>`
 """
 
-from dataclasses import dataclass, field
-
 from lxml import etree
 
 
@@ -41,7 +35,13 @@ class Namespace:
     xml: dict[str, str] = {"xml": "http://www.w3.org/XML/1998/namespace"}
 
 
-@dataclass
+# The <catDesc> of a <category>, the titles of a <bibl>, and the text of an
+# element, including the text of any elements within it
+_CAT_DESC = etree.XPath("string(tei:catDesc[1])", namespaces=Namespace.tei)
+_BIBL_TITLES = etree.XPath("tei:title", namespaces=Namespace.tei)
+_STRING_VALUE = etree.XPath("string()", smart_strings=False)
+
+
 class XMLElement:
     """Represents an XML element.
 
@@ -50,15 +50,14 @@ class XMLElement:
         id (str): The xml:id attribute.
     """
 
-    element: etree.Element
-    id: str = field(default_factory=str)
+    __slots__ = ("element", "id")
 
-    def __post_init__(self) -> None:
-        """Set the xml:id attribute."""
-        self.id = self.element.get("{http://www.w3.org/XML/1998/namespace}id")
+    def __init__(self, element: etree.Element) -> None:
+        """Set the element and its xml:id attribute."""
+        self.element: etree.Element = element
+        self.id: str = element.get("{http://www.w3.org/XML/1998/namespace}id")
 
 
-@dataclass
 class Category(XMLElement):
     """Represents a <category> element.
 
@@ -66,17 +65,14 @@ class Category(XMLElement):
         category_description (str): The description of the category.
     """
 
-    category_description: str = field(default_factory=str)
+    __slots__ = ("category_description",)
 
-    def __post_init__(self) -> None:
+    def __init__(self, element: etree.Element) -> None:
         """Set the category description."""
-        super().__post_init__()
-        self.category_description = self.element.findtext(
-            "tei:catDesc", namespaces=Namespace.tei
-        )
+        super().__init__(element)
+        self.category_description: str = _CAT_DESC(element)
 
 
-@dataclass
 class Bibl(XMLElement):
     """Represents a <bibl> element.
 
@@ -87,16 +83,13 @@ class Bibl(XMLElement):
         add_term: Add a <term> element to a <bibl> element.
     """
 
-    title: str = field(default_factory=str)
+    __slots__ = ("title",)
 
-    def __post_init__(self) -> None:
+    def __init__(self, element: etree.Element) -> None:
         """Set the title of the work."""
-        super().__post_init__()
-        self.title = ", ".join(
-            title.text
-            for title in self.element.findall(
-                "tei:title", namespaces=Namespace.tei
-            )
+        super().__init__(element)
+        self.title: str = ", ".join(
+            _STRING_VALUE(title) for title in _BIBL_TITLES(element)
         )
 
     def add_term(self, category: str) -> None:
@@ -14,16 +14,20 @@ Examples:
     >>> authority_file = AuthorityFile("persons.xml")
     >>> print(authority_file.keys)
 
+    To collect the same keys without keeping the whole tree in memory:
+
+    >>> print(set(AuthorityFile.stream_keys("persons.xml")))
+
     To read a works file and get a list of categories:
 
     >>> works_file = WorksFile("works.xml")
     >>> print(works_file.categories)
 
     To read a directory of manuscript descriptions
-    and get a list of file paths:
+    and list its file paths:
 
     >>> collections = Collections("manuscripts")
-    >>> print(collections.paths)
+    >>> print(list(collections.paths))
 
     To read a manuscript description and check
     if every @key reference is valid:
@@ -35,11 +39,25 @@ Examples:
 import os
 import re
 import sys
+from collections.abc import Iterator
+from functools import cached_property
 
 from lxml import etree
 
 from tei.elements import Category, Namespace
 
+_CATEGORIES = etree.XPath("//tei:category", namespaces=Namespace.tei)
+
+# A valid key, in the form of `prefix_1234`
+_KEY_RE = re.compile(r"\w+_\d+")
+
+# Clark names of xml:id and of the entities that carry it
+_XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+_TEI_TAGS: tuple[str, ...] = tuple(
+    f"{{http://www.tei-c.org/ns/1.0}}{tag}"
+    for tag in ("person", "place", "org", "bibl")
+)
+
 
 class XMLFile:
     """Represents an XML file, with modifications to reduce formatting changes.
@@ -51,7 +69,6 @@ class XMLFile:
     Methods:
         read: Create an XML tree from a file.
         write: Write the XML tree to the file with minimal formatting changes.
-        _fix_xml_declaration: Correct single quotes in lxml's XML declaration.
 
     Examples:
         To read an XML file and write it back to the file:
@@ -61,9 +78,13 @@ class XMLFile:
     """
 
     def __init__(self, file_path: str) -> None:
-        """Create an XML tree from a file."""
+        """Represent an XML file, to be parsed when its tree is first used."""
         self.file_path: str = file_path
-        self.tree = self.read()
+
+    @cached_property
+    def tree(self) -> etree.ElementTree:
+        """The XML tree, parsed from the file on first access."""
+        return self.read()
 
     def read(self) -> etree.ElementTree:
         """Create an XML tree from a file."""
@@ -73,23 +94,19 @@ class XMLFile:
         )
 
     def write(self) -> None:
-        """Write the XML tree to the file."""
-        self.tree.write(
-            self.file_path,
+        """Write the XML tree to the file.
+
+        The XML declaration is written separately, since lxml's own uses
+        single quotes.
+        """
+        data: bytes = etree.tostring(
+            self.tree,
             encoding="utf-8",
             pretty_print=True,
-            xml_declaration=True,
+            xml_declaration=False,
         )
-
-        self._fix_xml_declaration()
-
-    def _fix_xml_declaration(self) -> None:
-        """Fix the XML declaration with single quotes from lxml."""
-        with open(self.file_path, "r+", encoding="utf-8") as file:
-            file.seek(0)
-            file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            file.seek(0, 2)
-            file.truncate()
+        with open(self.file_path, "wb") as file:
+            file.write(b'<?xml version="1.0" encoding="UTF-8"?>\n' + data)
 
 
 class AuthorityFile(XMLFile):
@@ -99,6 +116,10 @@ class AuthorityFile(XMLFile):
         keys (set[str]): A set of all xml:id attributes on <person>, <place>,
         <org>, and <bibl> elements.
 
+    Methods:
+        stream_keys: Yield the same xml:id attributes from a file
+            without building a tree.
+
     Examples:
         To get a set of all xml:id attributes on <person>, <place>, <org>,
         and <bibl> elements:
@@ -114,15 +135,42 @@ class AuthorityFile(XMLFile):
         Returns:
             A set of xml:id attributes on <person>, <place>, <org>, and <bibl>.
         """
-        return {
-            elem.get("{http://www.w3.org/XML/1998/namespace}id")
-            for elem in self.tree.iter(
-                "{http://www.tei-c.org/ns/1.0}person",
-                "{http://www.tei-c.org/ns/1.0}place",
-                "{http://www.tei-c.org/ns/1.0}org",
-                "{http://www.tei-c.org/ns/1.0}bibl",
-            )
-        }
+        keys: set[str] = set()
+        add_key = keys.add
+        for elem in self.tree.iter(*_TEI_TAGS):
+            key = elem.get(_XML_ID)
+            if key is not None:
+                add_key(key)
+        return keys
+
+    @staticmethod
+    def stream_keys(file_path: str) -> Iterator[str]:
+        """Stream xml:id attributes for entities in an authority file.
+
+        Elements are discarded as soon as they have been read, so memory use
+        stays flat however large the file is.
+
+        Args:
+            file_path (str): The authority file path.
+
+        Yields:
+            The xml:id attributes on <person>, <place>, <org>, and <bibl>.
+        """
+        for _, elem in etree.iterparse(
+            file_path,
+            events=("end",),
+            tag=_TEI_TAGS,
+        ):
+            key = elem.get(_XML_ID)
+            if key is not None:
+                yield key
+
+            # free the element and any siblings that have already been read
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
 
 
 class WorksFile(AuthorityFile):
@@ -138,15 +186,10 @@ class WorksFile(AuthorityFile):
         >>> print(works_file.categories)
     """
 
-    @property
+    @cached_property
     def categories(self) -> list[Category]:
-        """Return a list of Category objects."""
-        return [
-            Category(category)
-            for category in self.tree.xpath(
-                "//tei:category", namespaces=Namespace.tei
-            )
-        ]
+        """Return a list of Category objects, read once per file."""
+        return [Category(category) for category in _CATEGORIES(self.tree)]
 
 
 class Collections:
@@ -156,7 +199,10 @@ class Collections:
         directory_path (str): The directory path.
 
     Methods:
-        paths: Returns a list of XML files in the directory.
+        paths: Yields the XML files in the directory and its subdirectories.
+        paths_by_inode: Lists the XML files in the order of their inodes.
+        _scan: Yields the directory entries of the XML files under a single
+            directory.
     """
 
     def __init__(self, directory_path: str) -> None:
@@ -164,19 +210,45 @@ class Collections:
         self.directory_path: str = directory_path
 
     @property
-    def paths(self) -> list[str]:
-        """Returns a list of XML files in the directory."""
-        return [
-            os.path.join(root, file)
-            for root, _, files in os.walk(self.directory_path)
-            for file in files
-            if file.endswith(".xml")
-        ]
+    def paths(self) -> Iterator[str]:
+        """Yields the XML files in the directory and its subdirectories."""
+        return (entry.path for entry in self._scan(self.directory_path))
+
+    @property
+    def paths_by_inode(self) -> list[str]:
+        """Lists the XML files in the order of their inodes.
+
+        The order tends to follow the files' layout on disk, which suits the
+        operating system's read-ahead. Inodes are read from the directory
+        listing, so the files themselves are not examined.
+        """
+        entries = sorted(
+            (entry.inode(), entry.path)
+            for entry in self._scan(self.directory_path)
+        )
+        return [path for _, path in entries]
+
+    def _scan(self, directory_path: str) -> Iterator[os.DirEntry]:
+        """Yields the entries of the XML files under a directory.
+
+        Args:
+            directory_path (str): The directory to scan.
+        """
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                # like os.walk, do not follow symbolic links to directories
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        yield from self._scan(entry.path)
+                elif entry.name.endswith(".xml"):
+                    yield entry
 
 
 class MSDesc(XMLFile):
     """Represents a TEI XML manuscript description.
 
+    The tree is only parsed if it is used: checking keys streams the file.
+
     Methods:
         check_keys: Check if every @key reference is valid.
     """
@@ -212,42 +284,51 @@ class MSDesc(XMLFile):
             >>> (False, ["person_1234", "place_5678"])
         """
         missing_keys: set[str] = set()
-
-        for key_elem in self.tree.xpath("//@key/parent::*"):
-            line_number: int = key_elem.sourceline
-            key: str = key_elem.get("key")
+        errors: list[str] = []
+
+        # stream the file rather than building its tree: keys are checked as
+        # each element starts, and elements are freed once they have ended
+        for event, elem in etree.iterparse(
+            self.file_path, events=("start", "end")
+        ):
+            if event == "end":
+                # the root has no parent, though it may follow a comment or
+                # a processing instruction such as <?xml-model?>
+                elem.clear(keep_tail=True)
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+                continue
+
+            # most keys are valid, so test for those before anything else
+            key: str | None = elem.get("key")
+            if key is None or key in authority_keys:
+                continue
+            line_number: int = elem.sourceline
 
             # is the key empty?
             if key == "":
-                sys.stderr.write(
-                    "Error: empty key in "
-                    + self.file_path
-                    + ", line "
-                    + str(line_number)
-                    + "\n"
+                errors.append(
+                    f"Error: empty key in {self.file_path}, "
+                    f"line {line_number}\n"
                 )
             # is the key in the form of `prefix_1234`?
-            elif not re.match(r"\w+_\d+", key):
-                sys.stderr.write(
-                    "Error: "
-                    + key
-                    + " is invalid in "
-                    + self.file_path
-                    + ", line "
-                    + str(line_number)
-                    + "\n"
+            elif not _KEY_RE.match(key):
+                errors.append(
+                    f"Error: {key} is invalid in {self.file_path}, "
+                    f"line {line_number}\n"
                 )
-            # is the key in the authority files?
-            elif key not in authority_keys:
-                sys.stderr.write(
-                    "Error: "
-                    + key
-                    + " not found in authority files in "
-                    + self.file_path
-                    + ", line "
-                    + str(line_number)
-                    + "\n"
+            # otherwise, the key is not in the authority files
+            else:
+                errors.append(
+                    f"Error: {key} not found in authority files in "
+                    f"{self.file_path}, line {line_number}\n"
                 )
                 missing_keys.add(key)
 
+        # report the errors for the file together
+        if errors:
+            sys.stderr.write("".join(errors))
+
         return missing_keys
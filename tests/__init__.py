@@ -0,0 +1 @@
+"""Tests for tei-msdesc-tools."""
@@ -0,0 +1,42 @@
+"""Tests for streaming TEI XML files with tei.xml."""
+
+import contextlib
+import io
+import os
+import unittest
+
+from tei.xml import AuthorityFile, MSDesc
+
+_FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class StreamingTest(unittest.TestCase):
+    """Stream files whose root follows a processing instruction."""
+
+    def test_check_keys(self) -> None:
+        """Check keys in a manuscript description with <?xml-model?>."""
+        file_path = os.path.join(_FIXTURES, "ms_xml_model.xml")
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            missing_keys = MSDesc(file_path).check_keys({"person_1"})
+
+        self.assertEqual(missing_keys, {"person_77"})
+        self.assertEqual(
+            stderr.getvalue(),
+            f"Error: person_77 not found in authority files in "
+            f"{file_path}, line 12\n"
+            f"Error: empty key in {file_path}, line 13\n"
+            f"Error: work-1 is invalid in {file_path}, line 14\n",
+        )
+
+    def test_stream_keys(self) -> None:
+        """Stream the keys of an authority file with <?xml-model?>."""
+        file_path = os.path.join(_FIXTURES, "persons_xml_model.xml")
+        self.assertEqual(
+            list(AuthorityFile.stream_keys(file_path)),
+            ["person_1", "person_2"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()